@@ -37,18 +37,55 @@ File Store:
             return {"file_id": file_id}
 """
 
-from .service import Service
-from .msgpack_service import MessagePackService
+import importlib
+from typing import TYPE_CHECKING
+
+# `method` is imported eagerly: it is tiny, and the `jb_service.method`
+# submodule would otherwise shadow it once anything imports the submodule.
 from .method import method
-from .protocol import run
-from .types import FilePath, Audio, Image, save_image, save_audio
-from .filestore import FileStore, FileInfo, FileStoreError, get_filestore
+
+if TYPE_CHECKING:
+    from .service import Service
+    from .msgpack_service import MessagePackService
+    from .protocol import run
+    from .types import FilePath, Audio, AudioLazy, Image, save_image, save_audio
+    from .filestore import FileStore, FileInfo, FileStoreError, get_filestore
+
+# Public name -> submodule, resolved on first attribute access (PEP 562)
+_LAZY = {
+    "Service": "service",
+    "MessagePackService": "msgpack_service",
+    "run": "protocol",
+    "FilePath": "types",
+    "Audio": "types",
+    "AudioLazy": "types",
+    "Image": "types",
+    "save_image": "types",
+    "save_audio": "types",
+    "FileStore": "filestore",
+    "FileInfo": "filestore",
+    "FileStoreError": "filestore",
+    "get_filestore": "filestore",
+}
 
 __version__ = "0.1.0"
 __all__ = [
     "Service", "MessagePackService", "method", "run",
-    "FilePath", "Audio", "Image",
+    "FilePath", "Audio", "AudioLazy", "Image",
     "save_image", "save_audio",
     "FileStore", "FileInfo", "FileStoreError", "get_filestore",
     "__version__"
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module("." + _LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return list(__all__)
@@ -7,10 +7,17 @@ Commands:
     jb-service init <name>           - Scaffold a new service (TODO)
 """
 import argparse
+import importlib
 import importlib.util
 import json
 import sys
 from pathlib import Path
+from string import Template
+from types import ModuleType
+
+
+# Service modules already executed in this process, keyed by resolved path
+_MODULE_CACHE: dict[str, ModuleType] = {}
 
 
 def load_service_from_file(filepath: str):
@@ -22,19 +29,23 @@ def load_service_from_file(filepath: str):
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         sys.exit(1)
     
-    # Load the module
-    spec = importlib.util.spec_from_file_location("_service_module", path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["_service_module"] = module
-    spec.loader.exec_module(module)
+    # Load the module (once per path)
+    key = str(path.resolve())
+    module = _MODULE_CACHE.get(key)
+    if module is None:
+        spec = importlib.util.spec_from_file_location("_service_module", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["_service_module"] = module
+        spec.loader.exec_module(module)
+        _MODULE_CACHE[key] = module
     
-    # Find Service subclasses
+    # Find Service subclasses, skipping the SDK's own base classes
+    # (e.g. an imported MessagePackService)
     services = []
-    for name in dir(module):
-        obj = getattr(module, name)
-        if (isinstance(obj, type) and 
-            issubclass(obj, Service) and 
-            obj is not Service):
+    for obj in module.__dict__.values():
+        if (isinstance(obj, type) and
+            issubclass(obj, Service) and
+            not obj.__module__.startswith('jb_service.')):
             services.append(obj)
     
     if not services:
@@ -48,10 +59,17 @@ def load_service_from_file(filepath: str):
     return services[0]
 
 
+def _get_yaml():
+    """Return the PyYAML module, reusing it if already imported."""
+    module = sys.modules.get('yaml')
+    if module is None:
+        module = importlib.import_module('yaml')
+    return module
+
+
 def cmd_manifest(args):
     """Generate jumpboot.yaml manifest from a service."""
     from .schema import service_to_schema
-    import yaml
     
     service_class = load_service_from_file(args.file)
     schema = service_to_schema(service_class)
@@ -79,9 +97,15 @@ def cmd_manifest(args):
     
     # Output as YAML
     try:
-        import yaml
-        print(yaml.dump(manifest, sort_keys=False, default_flow_style=False))
+        yaml = _get_yaml()
     except ImportError:
+        yaml = None
+    
+    if yaml is not None:
+        # Prefer the LibYAML C emitter when available
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        print(yaml.dump(manifest, Dumper=dumper, sort_keys=False, default_flow_style=False))
+    else:
         # Fallback to JSON if PyYAML not installed
         print(json.dumps(manifest, indent=2))
 
@@ -125,28 +149,17 @@ def cmd_test(args):
     service.teardown()
 
 
-def cmd_init(args):
-    """Scaffold a new service."""
-    name = args.name
-    path = Path(name)
-    
-    if path.exists():
-        print(f"Error: {path} already exists", file=sys.stderr)
-        sys.exit(1)
-    
-    path.mkdir()
-    
-    # Create main.py
-    main_py = f'''"""
-{name} service.
+# Scaffolding templates for `jb-service init`, parsed once at import
+_MAIN_TEMPLATE = Template('''"""
+$name service.
 """
 from jb_service import Service, method, run
 
 
-class {name.title().replace("-", "").replace("_", "")}(Service):
-    """{name.title()} service."""
+class $class_name(Service):
+    """$title service."""
     
-    name = "{name}"
+    name = "$name"
     version = "0.1.0"
     
     def setup(self):
@@ -163,27 +176,47 @@ class {name.title().replace("-", "").replace("_", "")}(Service):
         Returns:
             Greeting message
         """
-        return {{"message": f"Hello, {{name}}!"}}
+        return {"message": f"Hello, {name}!"}
 
 
 if __name__ == "__main__":
-    run({name.title().replace("-", "").replace("_", "")})
-'''
-    
-    (path / "main.py").write_text(main_py)
-    
-    # Create jumpboot.yaml
-    manifest = f'''name: {name}
+    run($class_name)
+''')
+
+_MANIFEST_TEMPLATE = Template('''name: $name
 version: 0.1.0
-description: {name.title()} service
+description: $title service
 
 runtime:
   python: "3.10"
   packages:
     - jb-service
-'''
+''')
+
+
+def cmd_init(args):
+    """Scaffold a new service."""
+    name = args.name
+    path = Path(name)
     
-    (path / "jumpboot.yaml").write_text(manifest)
+    if path.exists():
+        print(f"Error: {path} already exists", file=sys.stderr)
+        sys.exit(1)
+    
+    path.mkdir()
+    
+    title = name.title()
+    context = {
+        "name": name,
+        "title": title,
+        "class_name": title.replace("-", "").replace("_", ""),
+    }
+    
+    # Create main.py
+    (path / "main.py").write_text(_MAIN_TEMPLATE.substitute(context))
+    
+    # Create jumpboot.yaml
+    (path / "jumpboot.yaml").write_text(_MANIFEST_TEMPLATE.substitute(context))
     
     print(f"Created {path}/")
     print(f"  main.py        - Service implementation")
@@ -31,14 +31,27 @@ Usage:
 """
 import os
 import json
+import http.client
+import threading
 from typing import Optional, List
 from dataclasses import dataclass
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
 
+# Use orjson when installed; it works on bytes directly and is much faster
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
 
-@dataclass
+# Requests that are safe to resend after the connection drops mid-response
+_RETRY_METHODS = frozenset(('GET', 'HEAD'))
+
+
+@dataclass(slots=True, frozen=True)
 class FileInfo:
     """Metadata about a stored file."""
     id: str
@@ -51,14 +64,15 @@ class FileInfo:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'FileInfo':
+        # Positional in field order: noticeably cheaper for large list() results
         return cls(
-            id=data['id'],
-            name=data['name'],
-            size=data['size'],
-            sha256=data['sha256'],
-            path=data.get('path', ''),
-            created_at=data['created_at'],
-            expires_at=data.get('expires_at', 0),
+            data['id'],
+            data['name'],
+            data['size'],
+            data['sha256'],
+            data.get('path', ''),
+            data['created_at'],
+            data.get('expires_at', 0),
         )
 
 
@@ -83,6 +97,15 @@ class FileStore:
         """
         self.base_url = base_url or os.environ.get('JB_SERVE_URL', 'http://localhost:9800')
         self._store_url = f"{self.base_url}/v1/store"
+        
+        # Single keep-alive connection, reused across requests
+        parts = urlsplit(self.base_url)
+        self._conn_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                            else http.client.HTTPConnection)
+        self._host = parts.hostname or 'localhost'
+        self._port = parts.port
+        self._conn: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
     
     def import_file(self, path: str, name: str = None, ttl: int = 0) -> str:
         """
@@ -106,8 +129,12 @@ class FileStore:
         if not os.path.exists(path):
             raise FileNotFoundError(f"File not found: {path}")
         
+        # Only relative paths need resolving against the cwd
+        if not os.path.isabs(path):
+            path = os.path.abspath(path)
+        
         data = {
-            'path': os.path.abspath(path),
+            'path': path,
             'name': name or os.path.basename(path),
             'ttl': int(ttl),  # Ensure integer for Go
         }
@@ -170,7 +197,7 @@ class FileStore:
         
         result = self._request('GET', url)
         files = result.get('files') or []
-        return [FileInfo.from_dict(f) for f in files]
+        return list(map(FileInfo.from_dict, files))
     
     def rename(self, file_id: str, name: str) -> FileInfo:
         """
@@ -222,25 +249,58 @@ class FileStore:
     
     def _request(self, method: str, url: str, json_data: dict = None) -> dict:
         """Make an HTTP request to the store."""
-        headers = {'Content-Type': 'application/json'}
+        headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
         body = None
         
         if json_data is not None:
-            body = json.dumps(json_data).encode('utf-8')
+            body = _dumps(json_data)
+        
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
         
-        req = Request(url, data=body, headers=headers, method=method)
+        with self._lock:
+            status, reason, data = self._send(method, path, body, headers)
         
-        try:
-            with urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode('utf-8'))
-        except HTTPError as e:
+        if status >= 400:
             try:
-                error = json.loads(e.read().decode('utf-8'))
-                raise FileStoreError(error.get('error', str(e)))
-            except (json.JSONDecodeError, KeyError):
-                raise FileStoreError(f"HTTP {e.code}: {e.reason}")
-        except URLError as e:
-            raise FileStoreError(f"Connection failed: {e.reason}")
+                error = _loads(data)
+                raise FileStoreError(error.get('error', f"HTTP {status}: {reason}"))
+            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                raise FileStoreError(f"HTTP {status}: {reason}")
+        
+        return _loads(data)
+    
+    def _send(self, method: str, path: str, body: bytes | None, headers: dict):
+        """Send a request on the pooled connection, reconnecting once if it went stale."""
+        while True:
+            reused = self._conn is not None
+            if not reused:
+                self._conn = self._conn_class(self._host, self._port, timeout=30)
+            sent = False
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                sent = True
+                resp = self._conn.getresponse()
+                data = resp.read()
+                if resp.will_close:
+                    self._close()
+                return resp.status, resp.reason, data
+            except (http.client.HTTPException, ConnectionError) as e:
+                # The server may have dropped the keep-alive connection. Only
+                # resend if it can't have seen the request or repeating is harmless
+                self._close()
+                if not reused or (sent and method not in _RETRY_METHODS):
+                    raise FileStoreError(f"Connection failed: {e}")
+            except OSError as e:
+                self._close()
+                raise FileStoreError(f"Connection failed: {e}")
+    
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 # Convenience function for standalone use
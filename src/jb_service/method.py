@@ -1,12 +1,51 @@
 """
 @method decorator for marking RPC endpoints.
 """
-from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, NamedTuple, get_type_hints
 import inspect
 
+from .types import get_file_type_name
 
-def method(func: Callable = None, *, stream: bool = False) -> Callable:
+
+class MethodInfo(NamedTuple):
+    """Per-method facts resolved once, when the Service class is created."""
+    func: Callable  # The decorated (unbound) function
+    is_async: bool
+    is_stream: bool
+    is_batch: bool
+    file_params: tuple[tuple[str, str], ...]  # (param_name, file type name), FilePath excluded
+    single_arg: str | None  # Sole required parameter, if there is exactly one
+
+
+def get_type_hints_safe(fn):
+    """
+    Get type hints, handling forward references gracefully.
+    
+    Resolved hints of @method functions are cached on the function. Hints
+    that fail to resolve (e.g. a forward reference to a class that isn't
+    defined yet) are not cached, so a later call can still succeed.
+    """
+    hints = getattr(fn, '_jb_hints', None)
+    if hints is not None:
+        return hints
+    try:
+        hints = get_type_hints(fn)
+    except Exception:
+        return getattr(fn, '__annotations__', {})
+    if getattr(fn, '_jb_method', False):
+        fn._jb_hints = hints
+    return hints
+
+
+def get_signature(fn) -> inspect.Signature:
+    """Get a function's signature, using the one cached by @method if present."""
+    sig = getattr(fn, '_jb_sig', None)
+    if sig is None:
+        sig = inspect.signature(fn)
+    return sig
+
+
+def method(func: Callable = None, *, stream: bool = False, batch: bool = False) -> Callable:
     """
     Mark a method as an RPC endpoint.
     
@@ -19,25 +58,27 @@ def method(func: Callable = None, *, stream: bool = False) -> Callable:
         
         @method(stream=True)  # Reserved for future streaming support
         def baz(self): ...
+        
+        @method(batch=True)  # Receives batch=[params, ...], returns a list
+        def qux(self, batch: list[dict]) -> list: ...
+    
+    Batch methods are called once per group of requests that arrive
+    close together (MessagePack transport), and must return one result
+    per item, in order.
     """
     def decorator(fn: Callable) -> Callable:
-        # Mark the function as a jb method
+        # Mark the function in place - no wrapper, so calls cost nothing extra
         fn._jb_method = True
         fn._jb_stream = stream
+        fn._jb_batch = batch
         
-        # Preserve function metadata
-        @wraps(fn)
-        def wrapper(*args, **kwargs):
-            return fn(*args, **kwargs)
-        
-        # Copy our markers to the wrapper
-        wrapper._jb_method = True
-        wrapper._jb_stream = stream
+        # Kept for callers that look up the original for schema extraction
+        fn._jb_original = fn
         
-        # Store original function for schema extraction
-        wrapper._jb_original = fn
+        # Introspect once; protocols and schema generation reuse it
+        fn._jb_sig = inspect.signature(fn)
         
-        return wrapper
+        return fn
     
     # Handle @method without parentheses
     if func is not None:
@@ -63,3 +104,38 @@ def is_async_method(obj: Any) -> bool:
 def is_stream_method(obj: Any) -> bool:
     """Check if a @method is a streaming method."""
     return is_method(obj) and getattr(obj, '_jb_stream', False)
+
+
+def is_batch_method(obj: Any) -> bool:
+    """Check if a @method takes batched requests."""
+    return is_method(obj) and getattr(obj, '_jb_batch', False)
+
+
+def method_info(obj: Any) -> MethodInfo:
+    """Resolve the dispatch metadata for a @method decorated function."""
+    fn = getattr(obj, '_jb_original', obj)
+    hints = get_type_hints_safe(fn)
+    
+    file_params = []
+    for param_name, annotation in hints.items():
+        if param_name == 'return':
+            continue
+        type_name = get_file_type_name(annotation)
+        # FilePath values are used as-is, so callers never need to see them
+        if type_name and type_name != 'FilePath':
+            file_params.append((param_name, type_name))
+    
+    required = [
+        name for name, param in get_signature(fn).parameters.items()
+        if name != 'self' and param.default is inspect.Parameter.empty
+        and param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+    ]
+    
+    return MethodInfo(
+        func=fn,
+        is_async=inspect.iscoroutinefunction(fn),
+        is_stream=bool(getattr(fn, '_jb_stream', False)),
+        is_batch=bool(getattr(fn, '_jb_batch', False)),
+        file_params=tuple(file_params),
+        single_arg=required[0] if len(required) == 1 else None,
+    )
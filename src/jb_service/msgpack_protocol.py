@@ -2,24 +2,35 @@
 MessagePack queue protocol for jb-service.
 
 Uses jumpboot's MessagePackQueueServer for clean RPC without stdout interference.
+
+Threading: the event loop that ran setup_async keeps running on its own
+"jb-service-loop" thread, and every coroutine the service defines (async and
+batch methods, teardown_async) is submitted to it, so objects bound to that
+loop stay usable. Sync methods run on the queue server's thread, so sync and
+async methods may run concurrently.
 """
 import asyncio
-import time
-import traceback
-from typing import Type, get_type_hints, Any
 import inspect
+import threading
+import traceback
+from types import CodeType, FunctionType
+from typing import Type
+
+from .service import Service, _writer
+from .method import MethodInfo, get_signature
+from .protocol import _DEBUG_TB, new_event_loop
+from .types import convert_file_param, preload_file_loaders
 
-from .service import Service
-from .method import is_method, is_async_method
-from .types import get_file_type_name, convert_file_param
 
+# Batch methods: how long to gather requests, and the most per call
+_BATCH_WINDOW = 0.0002  # seconds
+_BATCH_MAX = 64
 
-def get_type_hints_safe(fn):
-    """Get type hints, handling forward references gracefully."""
-    try:
-        return get_type_hints(fn)
-    except Exception:
-        return getattr(fn, '__annotations__', {})
+# How long __jb_shutdown__ leaves the server to send its reply before the
+# main thread is released, and how often the main thread checks whether
+# the server has stopped on its own
+_SHUTDOWN_GRACE = 0.1
+_RUNNING_POLL = 1.0
 
 
 def run_msgpack(service_class: Type[Service]):
@@ -39,88 +50,270 @@ def run_msgpack(service_class: Type[Service]):
     service = service_class()
     
     # Create event loop for async support
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
     
     # Call setup
-    if asyncio.iscoroutinefunction(service_class.setup_async):
-        if service_class.setup_async is not Service.setup_async:
-            loop.run_until_complete(service.setup_async())
-        else:
-            service.setup()
+    if service_class._has_setup_async:
+        loop.run_until_complete(service.setup_async())
     else:
         service.setup()
     
+    # Import file libraries now rather than on the first call that needs them
+    preload_file_loaders(service_class._file_types)
+    
+    # From here on the loop lives on its own thread: async methods and
+    # teardown_async are submitted to it, so they share whatever
+    # setup_async created. Detach it from this thread so the queue
+    # server never tries to drive it too.
+    asyncio.set_event_loop(None)
+    threading.Thread(target=loop.run_forever, name="jb-service-loop", daemon=True).start()
+    
     # Create server without auto-exposing (we'll register manually)
     server = MessagePackQueueServer(auto_start=False, expose_methods=False)
     
     # Register each @method as a handler using register_handler
     # (which takes data, request_id directly without signature inspection)
     for method_name, method in service._methods.items():
-        wrapper = _create_method_wrapper(service, method_name, method, loop)
+        info = service_class._method_info[method_name]
+        if info.is_batch:
+            wrapper = _create_batch_wrapper(method, info, loop)
+        else:
+            wrapper = _create_method_wrapper(method, info, loop)
         server.register_handler(method_name, wrapper)
     
-    # Register introspection methods
+    # Set shortly after __jb_shutdown__ to release the main thread
+    stop = threading.Event()
+    
+    # Register introspection methods. The method set is fixed once the
+    # service exists, so answer from a snapshot.
+    methods_snapshot = service._list_methods()
+    
     async def jb_methods(data, request_id):
-        return service._list_methods()
+        return methods_snapshot
     server.register_handler("__jb_methods__", jb_methods)
     
     async def jb_shutdown(data, request_id):
-        if asyncio.iscoroutinefunction(type(service).teardown_async):
-            if type(service).teardown_async is not Service.teardown_async:
-                loop.run_until_complete(service.teardown_async())
-            else:
-                service.teardown()
+        if service_class._has_teardown_async:
+            await _on_loop(service.teardown_async(), loop)
         else:
             service.teardown()
-        server.running = False
+        loop.call_soon_threadsafe(loop.stop)
+        _writer.flush()
+        
+        # The server writes this handler's reply after it returns, and
+        # there's no hook for when that's done; stop once it has had time
+        def finish():
+            server.running = False
+            stop.set()
+        timer = threading.Timer(_SHUTDOWN_GRACE, finish)
+        timer.daemon = True
+        timer.start()
         return {"ok": True}
     server.register_handler("__jb_shutdown__", jb_shutdown)
     
-    # Start and run
+    # Start the server in the background and park until __jb_shutdown__, or
+    # until the server stops by itself (e.g. jb-serve went away)
     server.start()
-    while server.running:
-        time.sleep(0.1)
+    while server.running and not stop.wait(_RUNNING_POLL):
+        pass
+
+
+def _method_error(e: Exception) -> Exception:
+    """Build the exception reported back to jb-serve for a failed call."""
+    msg = f"{type(e).__name__}: {e}"
+    if _DEBUG_TB:
+        msg += "\n" + traceback.format_exc()
+    return Exception(msg)
+
+
+def _convert_if_path(value, type_name: str):
+    """Convert a file parameter if it arrived as a path string."""
+    if isinstance(value, str):
+        return convert_file_param(value, type_name)
+    return value
+
+
+# Compiled keyword adapters, shared by methods with the same parameter layout
+_ADAPTER_CODE: dict[tuple, CodeType] = {}
+
+
+def _build_adapter(info: MethodInfo):
+    """
+    Generate a function that calls a method with its exact keyword arguments.
+    
+    For `def add(self, a, b=1.0)` this produces the equivalent of:
+    
+        def adapter(method, data, _d0=1.0):
+            return method(a=data['a'], b=data['b'] if 'b' in data else _d0)
+    
+    with file-typed parameters converted inline. Returns (adapter, required
+    names, accepted names), or None for signatures it can't express
+    (*args, **kwargs, positional-only).
+    """
+    file_types = dict(info.file_params)
+    params = []
+    for name, param in get_signature(info.func).parameters.items():
+        if name == 'self':
+            continue
+        if param.kind not in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+            return None
+        params.append(param)
+    
+    layout = tuple(
+        (p.name, p.default is not inspect.Parameter.empty, file_types.get(p.name))
+        for p in params
+    )
+    code = _ADAPTER_CODE.get(layout)
+    if code is None:
+        args = []
+        slots = []
+        for name, has_default, type_name in layout:
+            value = f"data[{name!r}]"
+            if type_name:
+                value = f"_convert_if_path({value}, {type_name!r})"
+            if has_default:
+                slot = f"_d{len(slots)}"
+                slots.append(f"{slot}=None")
+                value = f"{value} if {name!r} in data else {slot}"
+            args.append(f"{name}={value}")
+        
+        src = (
+            f"def adapter(method, data{''.join(', ' + s for s in slots)}):\n"
+            f"    return method({', '.join(args)})\n"
+        )
+        namespace = {}
+        exec(compile(src, "<jb-service adapter>", "exec"), namespace)
+        code = namespace['adapter'].__code__
+        _ADAPTER_CODE[layout] = code
+    
+    # Same code object, per-method default values
+    defaults = tuple(p.default for p in params if p.default is not inspect.Parameter.empty)
+    adapter = FunctionType(code, {'_convert_if_path': _convert_if_path},
+                           'adapter', defaults or None)
+    required = frozenset(name for name, has_default, _ in layout if not has_default)
+    accepted = frozenset(name for name, _, _ in layout)
+    return adapter, required, accepted
 
 
-def _create_method_wrapper(service: Service, method_name: str, method, loop):
+def _on_loop(coro, loop: asyncio.AbstractEventLoop | None):
+    """Run coro on the service loop, awaitable from the queue server's loop.
+    
+    With no service loop (e.g. in tests) the coroutine is returned as-is.
+    """
+    if loop is None:
+        return coro
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def _create_method_wrapper(method, info: MethodInfo, loop: asyncio.AbstractEventLoop | None = None):
     """Create a wrapper for a service method.
     
     The wrapper handles file type conversion and calls the original method.
+    Async methods run on loop, the service's event loop thread.
     Uses register_handler signature: (data, request_id).
     """
-    fn = getattr(method, '_jb_original', method)
-    hints = get_type_hints_safe(fn)
+    file_params = info.file_params
+    single_arg = info.single_arg
     
-    async def wrapper(data, request_id):
+    def to_kwargs(data):
+        # Extract kwargs from data. Methods with one required parameter
+        # also accept the bare value, without a wrapping map.
+        if isinstance(data, dict):
+            return data
+        if single_arg is not None and data is not None:
+            return {single_arg: data}
+        return {}
+    
+    def convert(kwargs):
+        # Convert file parameters based on type hints. The handler owns
+        # kwargs - the server decodes a fresh map per request - so paths
+        # are replaced in place rather than on a copy
+        for param_name, type_name in file_params:
+            value = kwargs.get(param_name)
+            if isinstance(value, str):
+                kwargs[param_name] = convert_file_param(value, type_name)
+        return kwargs
+    
+    built = _build_adapter(info)
+    if built is None:
+        def call(data):
+            return method(**convert(to_kwargs(data)))
+    else:
+        adapter, required, accepted = built
+        
+        def call(data):
+            kwargs = to_kwargs(data)
+            if required <= kwargs.keys() <= accepted:
+                return adapter(method, kwargs)
+            # Missing or unexpected arguments: let the real call raise
+            return method(**convert(kwargs))
+    
+    async def _async_wrapper(data, request_id):
         try:
-            # Extract kwargs from data
-            kwargs = data if isinstance(data, dict) else {}
-            
-            # Convert file parameters based on type hints
-            converted = dict(kwargs)
-            for param_name, annotation in hints.items():
-                if param_name == 'return':
-                    continue
-                if param_name not in converted:
-                    continue
-                
-                type_name = get_file_type_name(annotation)
-                if type_name and isinstance(converted[param_name], str):
-                    converted[param_name] = convert_file_param(
-                        converted[param_name], type_name
+            return await _on_loop(call(data), loop)
+        except Exception as e:
+            raise _method_error(e) from e
+    
+    async def _sync_wrapper(data, request_id):
+        try:
+            return call(data)
+        except Exception as e:
+            raise _method_error(e) from e
+    
+    if info.is_async:
+        return _async_wrapper
+    return _sync_wrapper
+
+
+def _create_batch_wrapper(method, info: MethodInfo, loop: asyncio.AbstractEventLoop | None = None):
+    """Create a handler that coalesces requests for a @method(batch=True).
+    
+    Requests arriving within _BATCH_WINDOW of the first are queued and
+    passed to the method together as batch=[params, ...], up to
+    _BATCH_MAX at a time. Each caller gets its own item of the result.
+    """
+    pending: list[tuple[dict, asyncio.Future]] = []
+    flushing = False
+    
+    async def flush():
+        nonlocal flushing
+        await asyncio.sleep(_BATCH_WINDOW)
+        
+        # Requests that arrive while a batch runs are picked up here too
+        while pending:
+            items = pending[:_BATCH_MAX]
+            del pending[:_BATCH_MAX]
+            try:
+                results = method(batch=[kwargs for kwargs, _ in items])
+                if info.is_async:
+                    results = await _on_loop(results, loop)
+                if len(results) != len(items):
+                    raise ValueError(
+                        f"batch method returned {len(results)} results for {len(items)} requests"
                     )
+            except Exception as e:
+                error = _method_error(e)
+                error.__cause__ = e
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
             
-            # Call the method
-            if is_async_method(method):
-                result = await method(**converted)
-            else:
-                result = method(**converted)
-            
-            return result
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
         
-        except Exception as e:
-            # Re-raise with traceback info
-            raise Exception(f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}")
+        flushing = False
+    
+    async def wrapper(data, request_id):
+        nonlocal flushing
+        server_loop = asyncio.get_running_loop()
+        future = server_loop.create_future()
+        pending.append((data if isinstance(data, dict) else {}, future))
+        if not flushing:
+            flushing = True
+            server_loop.create_task(flush())
+        return await future
     
     return wrapper
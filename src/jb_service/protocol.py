@@ -12,26 +12,92 @@ the REPL can call directly, then return. The service instance stays
 alive in the Python process.
 """
 import asyncio
+import dataclasses
 import inspect
 import json
+import os
 import sys
 import traceback
-from typing import Any, Type, get_type_hints
+from typing import Any, Callable, Type, get_args
 
-from pydantic import BaseModel, ValidationError, create_model
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+from typing_extensions import NotRequired, TypedDict
 
-from .service import Service
-from .method import is_method, is_async_method
+from .service import Service, _writer
+from .method import get_signature, get_type_hints_safe
 from .schema import service_to_schema, method_to_schema
-from .types import get_file_type_name, convert_file_param
+from .types import convert_file_param, preload_file_loaders
 
+# Full tracebacks are costly to format; only include them when asked to
+_DEBUG_TB = os.environ.get('JB_DEBUG_TRACEBACK') == '1'
 
-def get_type_hints_safe(fn):
-    """Get type hints, handling forward references gracefully."""
+# Encoding of the __jb_*__ return payloads: "json" (default) returns str,
+# "msgpack" returns bytes for a REPL bridge that can take binary results
+_ENCODE = os.environ.get('JB_ENCODE', 'json')
+
+if _ENCODE == 'msgpack':
+    import msgpack  # Explicit opt-in, so a missing package should be loud
+    
+    def _dumps(obj) -> bytes:
+        try:
+            return msgpack.packb(obj)
+        except (TypeError, OverflowError, ValueError) as e:
+            # Unencodable result (custom object, int beyond 64 bits, ...):
+            # reply with an error instead of raising into the bridge
+            return msgpack.packb({
+                "ok": False,
+                "error": {
+                    "type": type(e).__name__,
+                    "message": f"Result is not MessagePack serializable: {e}",
+                    "traceback": None,
+                },
+                "done": True,
+            })
+else:
+    # Use orjson when installed
     try:
-        return get_type_hints(fn)
-    except Exception:
-        return getattr(fn, '__annotations__', {})
+        import orjson
+        
+        def _dumps(obj) -> str:
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except TypeError:
+                # Types orjson doesn't handle (e.g. ints beyond 64 bits)
+                return json.dumps(obj)
+    except ImportError:
+        _dumps = json.dumps
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop for async methods, using uvloop when installed."""
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    
+    # Python 3.12+: coroutines that finish without suspending complete
+    # inside create_task, skipping a trip through the loop
+    if hasattr(asyncio, 'eager_task_factory'):
+        loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
+
+def _input_params(method_func) -> tuple[Callable, list[tuple[str, Any, Any]]]:
+    """
+    Resolve a method's input parameters once for the validator builders.
+    
+    Returns the original function and a list of (name, annotation, default)
+    for every parameter other than self. Unannotated parameters get Any.
+    """
+    fn = getattr(method_func, '_jb_original', method_func)
+    hints = get_type_hints_safe(fn)
+    params = [
+        (param_name, hints.get(param_name, Any), param.default)
+        for param_name, param in get_signature(fn).parameters.items()
+        if param_name != 'self'
+    ]
+    return fn, params
 
 
 def build_pydantic_model(method_func) -> Type[BaseModel] | None:
@@ -40,21 +106,14 @@ def build_pydantic_model(method_func) -> Type[BaseModel] | None:
     
     Returns None if the method has no parameters (other than self).
     """
-    fn = getattr(method_func, '_jb_original', method_func)
-    sig = inspect.signature(fn)
-    hints = get_type_hints_safe(fn)
+    fn, params = _input_params(method_func)
     
     fields = {}
-    for param_name, param in sig.parameters.items():
-        if param_name == 'self':
-            continue
-        
-        annotation = hints.get(param_name, Any)
-        
-        if param.default is inspect.Parameter.empty:
+    for param_name, annotation, default in params:
+        if default is inspect.Parameter.empty:
             fields[param_name] = (annotation, ...)
         else:
-            fields[param_name] = (annotation, param.default)
+            fields[param_name] = (annotation, default)
     
     if not fields:
         return None
@@ -62,6 +121,120 @@ def build_pydantic_model(method_func) -> Type[BaseModel] | None:
     return create_model(f'{fn.__name__}_Input', **fields)
 
 
+def _needs_model_dump(annotation) -> bool:
+    """Check if an annotation involves models that model_dump() would turn into dicts."""
+    if isinstance(annotation, type) and (
+        issubclass(annotation, BaseModel) or dataclasses.is_dataclass(annotation)
+    ):
+        return True
+    return any(_needs_model_dump(arg) for arg in get_args(annotation))
+
+
+def build_input_adapter(method_func) -> TypeAdapter | None:
+    """
+    Build a TypedDict TypeAdapter for validating method inputs.
+    
+    validate_python() returns the coerced dict directly, skipping the
+    model instance and model_dump() pass. Returns None if the method has
+    no parameters, or if a parameter involves a Pydantic model or
+    dataclass (which the model path hands to the method as a dict).
+    """
+    fn, params = _input_params(method_func)
+    
+    fields = {}
+    for param_name, annotation, default in params:
+        if _needs_model_dump(annotation):
+            return None
+        
+        # Omitted defaults are filled in by the method call itself
+        if default is inspect.Parameter.empty:
+            fields[param_name] = annotation
+        else:
+            fields[param_name] = NotRequired[annotation]
+    
+    if not fields:
+        return None
+    
+    return TypeAdapter(TypedDict(f'{fn.__name__}_Input', fields))
+
+
+# Annotations whose values can be passed through untouched when they already
+# have exactly that type (Pydantic would return them unchanged)
+_PRIMITIVE_TYPES = {str, int, float, bool, bytes, dict, list, Any}
+
+
+def _primitive_fast_path(method_func, validator: Callable[[dict], dict]) -> Callable[[dict], dict] | None:
+    """
+    Wrap validator with a pass-through for already-correct primitive params.
+    
+    Returns None unless every parameter is annotated with a primitive type.
+    Anything that would need coercion, is missing, or is unexpected still goes
+    to validator, so results and error messages are unchanged.
+    """
+    types = {}
+    required = set()
+    for param_name, annotation, default in _input_params(method_func)[1]:
+        if annotation is not Any and (
+            not isinstance(annotation, type) or annotation not in _PRIMITIVE_TYPES
+        ):
+            return None
+        types[param_name] = annotation
+        if default is inspect.Parameter.empty:
+            required.add(param_name)
+    
+    required = frozenset(required)
+    accepted = frozenset(types)
+    
+    def validate(params: dict) -> dict:
+        if required <= params.keys() <= accepted:
+            for name, value in params.items():
+                expected = types[name]
+                if expected is not Any and type(value) is not expected:
+                    break
+            else:
+                return params
+        return validator(params)
+    
+    return validate
+
+
+def build_validator(method_func) -> Callable[[dict], dict] | None:
+    """
+    Build a callable that validates and coerces a params dict.
+    
+    Uses a TypedDict adapter where possible, falling back to the
+    Pydantic model. Methods with only primitive-typed parameters skip
+    Pydantic when the params already have the right types. Returns None
+    if the method has no parameters.
+    """
+    try:
+        adapter = build_input_adapter(method_func)
+    except Exception:
+        # Anything the TypedDict route can't express goes through the model
+        adapter = None
+    
+    if adapter is not None:
+        validator = adapter.validate_python
+    else:
+        model = build_pydantic_model(method_func)
+        if model is None:
+            return None
+        validator = lambda params: model(**params).model_dump()
+    
+    return _primitive_fast_path(method_func, validator) or validator
+
+
+def _unbatched(method, is_async: bool) -> Callable:
+    """Adapt a @method(batch=True) to take a single call's params."""
+    if is_async:
+        async def call(**params):
+            return (await method(batch=[params]))[0]
+    else:
+        def call(**params):
+            return method(batch=[params])[0]
+    return call
+
+
 class Protocol:
     """
     Handles the jb-serve ↔ Python communication protocol.
@@ -69,57 +242,38 @@ class Protocol:
     
     def __init__(self, service: Service):
         self.service = service
-        self._input_models: dict[str, Type[BaseModel] | None] = {}
         self._loop: asyncio.AbstractEventLoop | None = None
         
-        # Pre-build input models for all methods
+        # Pre-resolve everything a call needs, so handle_call does a single
+        # lookup: (validator, is_async, bound method, file params)
+        self._dispatch: dict[str, tuple[Callable[[dict], dict] | None, bool, Callable, tuple]] = {}
         for name, method in service._methods.items():
-            self._input_models[name] = build_pydantic_model(method)
-    
-    def _get_loop(self) -> asyncio.AbstractEventLoop:
-        """Get or create an event loop for async methods."""
-        if self._loop is None or self._loop.is_closed():
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-        return self._loop
-    
-    def _validate_params(self, method_name: str, params: dict) -> dict:
-        """Validate and coerce input parameters using Pydantic."""
-        model = self._input_models.get(method_name)
-        if model is None:
-            return params
+            info = service._method_info[name]
+            if info.is_batch:
+                # Each REPL call is a batch of one; params are passed through as-is
+                self._dispatch[name] = (None, info.is_async, _unbatched(method, info.is_async), info.file_params)
+            else:
+                self._dispatch[name] = (build_validator(method), info.is_async, method, info.file_params)
         
-        try:
-            validated = model(**params)
-            return validated.model_dump()
-        except ValidationError as e:
-            raise ValueError(f"Invalid parameters: {e}")
+        # Schemas can't change once the service exists, so each is serialized
+        # on first request and kept. Not done up front: a schema that fails to
+        # serialize (e.g. a non-JSON default) must not stop the service.
+        self._schema_json: str | bytes | None = None
+        self._method_schema_json: dict[str, str | bytes] = {}
+        self._methods_json = _dumps(self.handle_methods())
     
-    def _convert_file_params(self, method_name: str, params: dict) -> dict:
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
         """
-        Convert file parameters based on type hints.
+        Get the event loop for async methods, creating it on first use.
         
-        If a parameter is typed as Audio, Image, etc., load the file
-        and replace the path with the loaded data.
+        The loop is never closed while the service runs, so it is created
+        (and set as the thread's loop) exactly once.
         """
-        method = self.service._get_method(method_name)
-        fn = getattr(method, '_jb_original', method)
-        hints = get_type_hints_safe(fn)
-        
-        converted = dict(params)
-        for param_name, annotation in hints.items():
-            if param_name == 'return':
-                continue
-            if param_name not in converted:
-                continue
-            
-            type_name = get_file_type_name(annotation)
-            if type_name and isinstance(converted[param_name], str):
-                converted[param_name] = convert_file_param(
-                    converted[param_name], type_name
-                )
-        
-        return converted
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop
     
     def handle_call(self, method_name: str, params: dict) -> dict:
         """
@@ -129,21 +283,32 @@ class Protocol:
         """
         try:
             # Get the method
-            method = self.service._get_method(method_name)
+            entry = self._dispatch.get(method_name)
+            if entry is None:
+                raise AttributeError(f"Unknown method: {method_name}")
+            validator, is_async, method, file_params = entry
             
-            # Validate parameters
-            validated_params = self._validate_params(method_name, params)
+            # Validate and coerce parameters using Pydantic
+            if validator is not None:
+                try:
+                    params = validator(params)
+                except ValidationError as e:
+                    raise ValueError(f"Invalid parameters: {e}")
             
-            # Convert file parameters (Audio, Image, etc.)
-            converted_params = self._convert_file_params(method_name, validated_params)
+            # Convert file parameters (Audio, Image, etc.). params is the
+            # fresh dict produced by validation, so update it in place
+            for param_name, type_name in file_params:
+                value = params.get(param_name)
+                if isinstance(value, str):
+                    params[param_name] = convert_file_param(value, type_name)
             
             # Call the method
-            if is_async_method(method):
+            if is_async:
                 # Run async method in event loop
                 loop = self._get_loop()
-                result = loop.run_until_complete(method(**converted_params))
+                result = loop.run_until_complete(method(**params))
             else:
-                result = method(**converted_params)
+                result = method(**params)
             
             return {"ok": True, "result": result, "done": True}
         
@@ -153,7 +318,7 @@ class Protocol:
                 "error": {
                     "type": type(e).__name__,
                     "message": str(e),
-                    "traceback": traceback.format_exc(),
+                    "traceback": traceback.format_exc() if _DEBUG_TB else None,
                 },
                 "done": True,
             }
@@ -167,9 +332,24 @@ class Protocol:
         method = self.service._get_method(method_name)
         return method_to_schema(method)
     
-    def handle_methods(self) -> list[str]:
+    def handle_methods(self) -> tuple[str, ...]:
         """Return list of available methods."""
         return self.service._list_methods()
+    
+    def schema_json(self) -> str | bytes:
+        """Return the serialized service schema, serializing it once."""
+        if self._schema_json is None:
+            self._schema_json = _dumps(self.handle_schema())
+        return self._schema_json
+    
+    def method_schema_json(self, method_name: str) -> str | bytes:
+        """Return a serialized method schema, serializing it once."""
+        schema_json = self._method_schema_json.get(method_name)
+        if schema_json is None:
+            # Unknown methods raise the usual AttributeError
+            schema_json = _dumps(self.handle_method_schema(method_name))
+            self._method_schema_json[method_name] = schema_json
+        return schema_json
 
 
 # Global service instance and protocol - set by run()
@@ -211,55 +391,56 @@ def run(service_class: Type[Service]):
     _protocol = Protocol(_service_instance)
     
     # Call setup
-    if asyncio.iscoroutinefunction(service_class.setup_async):
-        # Check if setup_async is overridden
-        if service_class.setup_async is not Service.setup_async:
-            loop = _protocol._get_loop()
-            loop.run_until_complete(_service_instance.setup_async())
-        else:
-            _service_instance.setup()
+    if service_class._has_setup_async:
+        loop = _protocol._get_loop()
+        loop.run_until_complete(_service_instance.setup_async())
     else:
         _service_instance.setup()
     
+    # Import file libraries now rather than on the first call that needs them
+    preload_file_loaders(service_class._file_types)
+    
     # Register globals for jumpboot REPL to call
     # These become available in the REPL's global namespace
     # All functions return JSON strings for easy parsing in Go
+    # (msgpack bytes instead when JB_ENCODE=msgpack)
     
-    def __jb_call__(method: str, params: dict = None) -> str:
+    def __jb_call__(method: str, params: dict = None) -> str | bytes:
         """Call a service method. Returns JSON string {ok, result/error, done}."""
         if params is None:
             params = {}
         result = _protocol.handle_call(method, params)
-        return json.dumps(result)
+        return _dumps(result)
     
-    def __jb_schema__() -> str:
+    def __jb_schema__() -> str | bytes:
         """Get full service schema as JSON string."""
-        return json.dumps(_protocol.handle_schema())
+        return _protocol.schema_json()
     
-    def __jb_method_schema__(method_name: str) -> str:
+    def __jb_method_schema__(method_name: str) -> str | bytes:
         """Get method schema as JSON string."""
-        return json.dumps(_protocol.handle_method_schema(method_name))
+        return _protocol.method_schema_json(method_name)
     
-    def __jb_methods__() -> str:
+    def __jb_methods__() -> str | bytes:
         """List available method names as JSON array string."""
-        return json.dumps(_protocol.handle_methods())
+        return _protocol._methods_json
     
-    def __jb_shutdown__() -> str:
+    def __jb_shutdown__() -> str | bytes:
         """Shutdown the service (calls teardown). Returns JSON string."""
         global _service_instance, _protocol
         if _service_instance is not None:
-            if asyncio.iscoroutinefunction(type(_service_instance).teardown_async):
-                if type(_service_instance).teardown_async is not Service.teardown_async:
-                    loop = _protocol._get_loop()
-                    loop.run_until_complete(_service_instance.teardown_async())
-                else:
-                    _service_instance.teardown()
+            if _service_instance._has_teardown_async:
+                loop = _protocol._get_loop()
+                loop.run_until_complete(_service_instance.teardown_async())
             else:
                 _service_instance.teardown()
             
+            # The process may be stopped right after this reply; don't
+            # leave teardown's log lines queued
+            _writer.flush()
+            
             _service_instance = None
             _protocol = None
-        return json.dumps({"ok": True})
+        return _dumps({"ok": True})
     
     # Register in builtins so they're accessible from REPL
     import builtins
@@ -1,10 +1,16 @@
 """
 Schema generation from type hints and Pydantic models.
 """
-from typing import Any, Callable, get_type_hints, get_origin, get_args, Union, Literal
+from typing import Any, Callable, get_origin, get_args, Union, Literal
+import functools
 import inspect
+import re
+import weakref
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
+from typing_extensions import is_typeddict
+
+from .method import get_signature, get_type_hints_safe
 
 
 # Type mapping from Python types to JSON schema
@@ -19,14 +25,34 @@ TYPE_MAP = {
 }
 
 
+def _copy_schema(schema):
+    """Copy the dicts and lists of a cached schema, sharing only the leaves."""
+    if isinstance(schema, dict):
+        return {key: _copy_schema(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [_copy_schema(value) for value in schema]
+    return schema
+
+
 def python_type_to_schema(py_type: Any) -> dict:
     """Convert a Python type hint to JSON schema."""
+    # Callers add keys (description, default) at any depth, so hand out a
+    # copy that shares no containers with the cache
+    try:
+        schema = _cached_type_schema(py_type)
+    except TypeError:
+        # Unhashable hint (e.g. Annotated metadata holding a dict): build it uncached
+        return _python_type_to_schema(py_type)
+    return _copy_schema(schema)
+
+
+def _python_type_to_schema(py_type: Any) -> dict:
     # Handle None
     if py_type is None or py_type is type(None):
         return {"type": "null"}
     
     # Handle basic types
-    if py_type in TYPE_MAP:
+    if isinstance(py_type, type) and py_type in TYPE_MAP:
         return TYPE_MAP[py_type].copy()
     
     # Handle Pydantic models
@@ -82,6 +108,16 @@ def python_type_to_schema(py_type: Any) -> dict:
     return {"type": "object"}
 
 
+# Type hints don't change at runtime, so their schemas are built once
+_cached_type_schema = functools.lru_cache(maxsize=None)(_python_type_to_schema)
+
+# method_to_schema results, per decorated function
+_method_schemas: "weakref.WeakKeyDictionary[Callable, dict]" = weakref.WeakKeyDictionary()
+
+# service_to_schema results, per Service class
+_service_schemas: "weakref.WeakKeyDictionary[type, dict]" = weakref.WeakKeyDictionary()
+
+
 def parse_docstring(docstring: str | None) -> dict:
     """
     Parse a docstring to extract description and argument descriptions.
@@ -92,47 +128,53 @@ def parse_docstring(docstring: str | None) -> dict:
             "args": {"arg_name": "arg description", ...}
         }
     """
+    # Docstrings never change, so each is parsed once; hand out a copy
+    info = _cached_parse_docstring(docstring)
+    return {"description": info["description"], "args": dict(info["args"])}
+
+
+# Docstring parsing: "arg_name: description" or "arg_name (type): description"
+_ARG_RE = re.compile(r'^([^:(]*)[^:]*:(.*)$')
+_ARGS_HEADERS = frozenset(('args:', 'arguments:', 'parameters:'))
+_OTHER_HEADERS = frozenset(('returns:', 'return:', 'raises:', 'yields:', 'examples:'))
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_parse_docstring(docstring: str | None) -> dict:
     if not docstring:
         return {"description": "", "args": {}}
     
-    lines = docstring.strip().split('\n')
     description_lines = []
     args = {}
     current_arg = None
     in_args_section = False
     
-    for line in lines:
+    for line in docstring.split('\n'):
         stripped = line.strip()
+        if not stripped:
+            continue
         
-        # Check for Args section
-        if stripped.lower() in ('args:', 'arguments:', 'parameters:'):
+        # Check for Args section, or other sections that end it
+        lowered = stripped.lower()
+        if lowered in _ARGS_HEADERS:
             in_args_section = True
             continue
-        
-        # Check for other sections that end Args
-        if stripped.lower() in ('returns:', 'return:', 'raises:', 'yields:', 'examples:'):
+        if lowered in _OTHER_HEADERS:
             in_args_section = False
             current_arg = None
             continue
         
         if in_args_section:
-            # Try to parse "arg_name: description" or "arg_name (type): description"
-            if ':' in stripped and not stripped.startswith(' '):
-                parts = stripped.split(':', 1)
-                arg_name = parts[0].strip()
-                # Remove type annotation if present: "arg_name (type)" -> "arg_name"
-                if '(' in arg_name:
-                    arg_name = arg_name.split('(')[0].strip()
-                arg_desc = parts[1].strip() if len(parts) > 1 else ""
-                args[arg_name] = arg_desc
-                current_arg = arg_name
-            elif current_arg and stripped:
+            match = _ARG_RE.match(stripped)
+            if match:
+                current_arg = match.group(1).strip()
+                args[current_arg] = match.group(2).strip()
+            elif current_arg:
                 # Continuation of previous arg description
                 args[current_arg] += " " + stripped
         else:
             # Part of main description
-            if stripped:
-                description_lines.append(stripped)
+            description_lines.append(stripped)
     
     return {
         "description": " ".join(description_lines),
@@ -155,18 +197,25 @@ def method_to_schema(method: Callable) -> dict:
     # Get the original function if wrapped
     fn = getattr(method, '_jb_original', method)
     
+    schema = _method_schemas.get(fn)
+    if schema is None:
+        schema = _method_schemas[fn] = _method_to_schema(fn)
+    return _copy_schema(schema)
+
+
+def _method_to_schema(fn: Callable) -> dict:
     # Get type hints
-    try:
-        hints = get_type_hints(fn)
-    except Exception:
-        hints = {}
+    hints = get_type_hints_safe(fn)
     
     # Get signature for defaults
-    sig = inspect.signature(fn)
+    sig = get_signature(fn)
     
     # Parse docstring
     doc_info = parse_docstring(fn.__doc__)
     
+    if getattr(fn, '_jb_batch', False):
+        return _batch_method_to_schema(fn, hints, sig, doc_info)
+    
     # Build input schema
     properties = {}
     required = []
@@ -215,6 +264,58 @@ def method_to_schema(method: Callable) -> dict:
     }
 
 
+def _list_item_type(annotation):
+    """The element type of a list[X] annotation, or None."""
+    if get_origin(annotation) is list:
+        args = get_args(annotation)
+        if args:
+            return args[0]
+    return None
+
+
+def _batch_method_to_schema(fn: Callable, hints: dict, sig: inspect.Signature, doc_info: dict) -> dict:
+    """
+    Schema for a @method(batch=True), describing a single call.
+    
+    Callers send one request's params and get one result back; batching
+    happens behind the method. The input is taken from the item type of the
+    batch parameter (a TypedDict or Pydantic model in list[...]), otherwise a
+    free-form object. The output is the item type of the returned list.
+    """
+    params = [name for name in sig.parameters if name != 'self']
+    item_type = _list_item_type(hints.get(params[0])) if params else None
+    
+    if item_type is not None and is_typeddict(item_type):
+        item_hints = get_type_hints_safe(item_type)
+        properties = {}
+        for field_name, annotation in item_hints.items():
+            prop_schema = python_type_to_schema(annotation)
+            if field_name in doc_info["args"]:
+                prop_schema["description"] = doc_info["args"][field_name]
+            properties[field_name] = prop_schema
+        input_schema = {"type": "object", "properties": properties}
+        required = [name for name in item_hints if name in item_type.__required_keys__]
+        if required:
+            input_schema["required"] = required
+    elif isinstance(item_type, type) and issubclass(item_type, BaseModel):
+        input_schema = python_type_to_schema(item_type)
+    else:
+        input_schema = {"type": "object"}
+    
+    output_type = _list_item_type(hints.get('return'))
+    if output_type is not None:
+        output_schema = python_type_to_schema(output_type)
+    else:
+        output_schema = {"type": "object"}
+    
+    return {
+        "name": fn.__name__,
+        "description": doc_info["description"],
+        "input": input_schema,
+        "output": output_schema,
+    }
+
+
 def service_to_schema(service_class: type) -> dict:
     """
     Generate full schema for a Service class.
@@ -227,6 +328,13 @@ def service_to_schema(service_class: type) -> dict:
             "methods": { method schemas }
         }
     """
+    schema = _service_schemas.get(service_class)
+    if schema is None:
+        schema = _service_schemas[service_class] = _service_to_schema(service_class)
+    return _copy_schema(schema)
+
+
+def _service_to_schema(service_class: type) -> dict:
     from .method import is_method
     
     # Get service metadata
@@ -234,14 +342,19 @@ def service_to_schema(service_class: type) -> dict:
     version = getattr(service_class, 'version', '0.0.0')
     description = (service_class.__doc__ or "").strip()
     
-    # Get method schemas
+    # Get method schemas, from the @method table resolved on first use
     methods = {}
-    for attr_name in dir(service_class):
-        if attr_name.startswith('_'):
-            continue
-        attr = getattr(service_class, attr_name)
-        if is_method(attr):
-            methods[attr_name] = method_to_schema(attr)
+    method_info = getattr(service_class, '_method_info', None)
+    if method_info is not None:
+        for method_name, info in method_info.items():
+            methods[method_name] = method_to_schema(info.func)
+    else:
+        for attr_name in dir(service_class):
+            if attr_name.startswith('_'):
+                continue
+            attr = getattr(service_class, attr_name)
+            if is_method(attr):
+                methods[attr_name] = method_to_schema(attr)
     
     return {
         "name": name,
@@ -1,12 +1,160 @@
 """
 Service base class for jb-serve services.
 """
+import atexit
+import collections
+import functools
+import inspect
 import logging
+import os
 import sys
 import json
+import threading
 from typing import Any
 
 from .filestore import FileStore
+from .method import MethodInfo, is_method, method_info
+
+# Compact stdlib encoder for when orjson is missing or rejects a value. Keeps
+# ensure_ascii so strings with lone surrogates (e.g. surrogateescape'd
+# filenames) are escaped rather than failing to encode.
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+_NEWLINE = b"\n"
+
+
+def _json_line(obj) -> bytes:
+    return _encode(obj).encode('utf-8') + _NEWLINE
+
+
+# Use orjson when installed; it encodes straight to bytes and is much faster
+try:
+    import orjson
+    
+    def _dumps_line(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson doesn't handle (e.g. ints beyond 64 bits)
+            return _json_line(obj)
+except ImportError:
+    _dumps_line = _json_line
+
+
+class _LogWriter:
+    """
+    Background writer shared by every ServiceLogger.
+    
+    Callers only append an encoded line to a queue; a writer thread writes
+    whatever has accumulated to stderr in one go, every _FLUSH_INTERVAL
+    seconds or when the queue is half full. Error and critical lines are
+    written synchronously by the caller instead. If the queue fills up anyway the oldest lines are
+    dropped, and the count is reported with the next write.
+    
+    The writer thread stops, after a final write, once the main thread has
+    finished. It is not a daemon, so interpreter shutdown (including a
+    multiprocessing child's) waits for that write. close() (run at exit)
+    drains anything logged after that. Forked children start over with an
+    empty queue and their own writer thread.
+    """
+    
+    _FLUSH_INTERVAL = 0.05
+    _MAX_QUEUE = 10000
+    
+    def __init__(self):
+        self._reset()
+    
+    def _reset(self):
+        # Also run in forked children: the parent's thread doesn't exist there,
+        # its lock may be held, and its queued lines belong to the parent
+        self._queue: collections.deque[bytes] = collections.deque(maxlen=self._MAX_QUEUE)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._dropped = 0
+    
+    def write(self, data: bytes, urgent: bool = False):
+        queue = self._queue
+        if len(queue) == self._MAX_QUEUE:
+            self._dropped += 1
+        queue.append(data)
+        
+        if urgent:
+            # Errors are written on the caller's thread before it carries on,
+            # together with anything queued ahead of them
+            self.flush()
+            return
+        
+        if self._thread is None:
+            self._start()
+        if len(queue) >= self._MAX_QUEUE // 2:
+            self._wake.set()
+    
+    def close(self):
+        """Stop the writer thread and write out anything still queued."""
+        self._closed = True
+        thread = self._thread
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout=1.0)
+        self.flush()
+    
+    def flush(self):
+        with self._lock:
+            self._write_out()
+    
+    def _start(self):
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="jb-service-log")
+                self._thread.start()
+    
+    def _write_out(self):
+        # Caller holds the lock. Resolve stderr at write time so a
+        # redirected sys.stderr is honoured.
+        queue = self._queue
+        batch = []
+        while queue:
+            batch.append(queue.popleft())
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            batch.append(_dumps_line({"log": {
+                "level": "warning",
+                "message": f"Dropped {dropped} log messages",
+                "name": "jb_service",
+            }}))
+        if not batch:
+            return
+        
+        data = b"".join(batch)
+        stderr = sys.stderr
+        out = getattr(stderr, 'buffer', None)
+        if out is not None:
+            stderr.flush()
+            out.write(data)
+            out.flush()
+        else:
+            stderr.write(data.decode('utf-8'))
+            stderr.flush()
+    
+    def _run(self):
+        wake = self._wake
+        main = threading.main_thread()
+        while not self._closed and main.is_alive():
+            wake.wait(self._FLUSH_INTERVAL)
+            wake.clear()
+            self.flush()
+        self.flush()
+
+
+_writer = _LogWriter()
+atexit.register(_writer.close)
+os.register_at_fork(after_in_child=_writer._reset)
+
+
+# Bit for each log level; JB_LOG_LEVEL enables that level and everything above
+_LEVELS = {"debug": 1, "info": 2, "warning": 4, "error": 8, "critical": 16}
+_LEVEL_MASK = -_LEVELS.get(os.environ.get('JB_LOG_LEVEL', 'debug').lower(), 1) & 31
 
 
 class ServiceLogger:
@@ -15,45 +163,83 @@ class ServiceLogger:
     
     Note: Logging is disabled by default when running under jumpboot REPL
     because the REPL captures stderr and it interferes with the protocol.
-    Enable with logger._enabled = True if you need logs.
+    Enable with logger._enabled = True if you need logs. JB_LOG_LEVEL
+    (debug, info, warning, error, critical) sets the minimum level emitted
+    once enabled.
     """
     
+    __slots__ = ('name', '_level_mask')
+    
     def __init__(self, name: str):
         self.name = name
-        self._enabled = False  # Disabled by default for REPL compatibility
+        self._level_mask = 0  # Disabled by default for REPL compatibility
+    
+    @property
+    def _enabled(self) -> bool:
+        return self._level_mask != 0
+    
+    @_enabled.setter
+    def _enabled(self, value: bool):
+        self._level_mask = _LEVEL_MASK if value else 0
     
     def _emit(self, level: str, message: str, extra: dict | None = None):
         """Emit a log message via the jb protocol."""
-        if not self._enabled:
-            return
-        
-        log_msg = {
-            "log": {
-                "level": level,
-                "message": message,
-                "name": self.name,
-            }
-        }
+        payload = {"level": level, "message": message, "name": self.name}
         if extra:
-            log_msg["log"]["extra"] = extra
+            payload["extra"] = extra
         
-        # Write to stderr to avoid mixing with protocol messages on stdout
-        print(json.dumps(log_msg), file=sys.stderr, flush=True)
+        # Write to stderr to avoid mixing with protocol messages on stdout.
+        # The writer thread batches lines; errors are written before returning.
+        data = _dumps_line({"log": payload})
+        _writer.write(data, urgent=level in ("error", "critical"))
+    
+    # Each level checks its bit before doing any work, so disabled or
+    # filtered calls cost a single attribute read
     
     def debug(self, message: str, extra: dict | None = None):
-        self._emit("debug", message, extra)
+        if self._level_mask & 1:
+            self._emit("debug", message, extra)
     
     def info(self, message: str, extra: dict | None = None):
-        self._emit("info", message, extra)
+        if self._level_mask & 2:
+            self._emit("info", message, extra)
     
     def warning(self, message: str, extra: dict | None = None):
-        self._emit("warning", message, extra)
+        if self._level_mask & 4:
+            self._emit("warning", message, extra)
     
     def error(self, message: str, extra: dict | None = None):
-        self._emit("error", message, extra)
+        if self._level_mask & 8:
+            self._emit("error", message, extra)
     
     def critical(self, message: str, extra: dict | None = None):
-        self._emit("critical", message, extra)
+        if self._level_mask & 16:
+            self._emit("critical", message, extra)
+
+
+class _ResolvedOnce:
+    """Class attribute computed from the class on first access, then stored on it."""
+    
+    def __init__(self, name: str, compute):
+        self.name = name
+        self.compute = compute
+    
+    def __get__(self, obj, cls):
+        value = self.compute(cls)
+        setattr(cls, self.name, value)
+        return value
+
+
+def _resolve_method_info(cls) -> dict[str, MethodInfo]:
+    return {name: method_info(getattr(cls, name)) for name in cls._method_names}
+
+
+def _resolve_file_types(cls) -> frozenset[str]:
+    return frozenset(
+        type_name
+        for info in cls._method_info.values()
+        for _, type_name in info.file_params
+    )
 
 
 class Service:
@@ -75,27 +261,61 @@ class Service:
     name: str = None  # Defaults to class name lowercase
     version: str = "0.0.0"
     
-    def __init__(self):
-        from .method import is_method
+    # Dispatch metadata for each @method, set up per subclass
+    _method_info: dict[str, MethodInfo] = {}
+    _method_names: tuple[str, ...] = ()
+    
+    # File types (see jb_service.types) taken by any @method
+    _file_types: frozenset[str] = frozenset()
+    
+    # Lowercased class name, used when name is left as None
+    _default_name: str = "service"
+    
+    # Whether setup_async/teardown_async are overridden with coroutines
+    _has_setup_async: bool = False
+    _has_teardown_async: bool = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
         
+        cls._default_name = cls.__name__.lower()
+        
+        cls._has_setup_async = (
+            cls.setup_async is not Service.setup_async and
+            inspect.iscoroutinefunction(cls.setup_async)
+        )
+        cls._has_teardown_async = (
+            cls.teardown_async is not Service.teardown_async and
+            inspect.iscoroutinefunction(cls.teardown_async)
+        )
+        
+        cls._method_names = tuple(
+            attr_name for attr_name in dir(cls)
+            if not attr_name.startswith('_') and is_method(getattr(cls, attr_name))
+        )
+        
+        # Metadata that depends on type hints is resolved on first use, once
+        # per class. Not here: the class body has only just run, so forward
+        # references (e.g. with `from __future__ import annotations`) to
+        # names defined later in the module can't be resolved yet.
+        cls._method_info = _ResolvedOnce('_method_info', _resolve_method_info)
+        cls._file_types = _ResolvedOnce('_file_types', _resolve_file_types)
+    
+    def __init__(self):
         # Set default name from class name
         if self.name is None:
-            self.name = self.__class__.__name__.lower()
+            self.name = self._default_name
         
         # Initialize logger
         self.log = ServiceLogger(self.name)
         
         # Initialize file store client
         self.files = FileStore()
-        
-        # Discover @method decorated methods
-        self._methods: dict[str, Any] = {}
-        for attr_name in dir(self):
-            if attr_name.startswith('_'):
-                continue
-            attr = getattr(self, attr_name)
-            if is_method(attr):
-                self._methods[attr_name] = attr
+    
+    @functools.cached_property
+    def _methods(self) -> dict[str, Any]:
+        """The @method functions bound to this instance, by name (built on first use)."""
+        return {name: getattr(self, name) for name in self._method_names}
     
     def setup(self):
         """
@@ -127,10 +347,10 @@ class Service:
     
     def _get_method(self, name: str):
         """Get a method by name."""
-        if name not in self._methods:
+        if name not in self._method_info:
             raise AttributeError(f"Unknown method: {name}")
-        return self._methods[name]
+        return getattr(self, name)
     
-    def _list_methods(self) -> list[str]:
+    def _list_methods(self) -> tuple[str, ...]:
         """List available method names."""
-        return list(self._methods.keys())
+        return self._method_names
@@ -4,11 +4,12 @@ File types for jb-service methods.
 These types tell jb-service how to handle file inputs:
 - FilePath: Pass as-is (string path)
 - Audio: Load as (sample_rate, numpy_array)
+- AudioLazy: Open as a LazyAudio, reading only the frames asked for
 - Image: Load as PIL.Image
 
 Usage:
     from jb_service import Service, method
-    from jb_service.types import FilePath, Audio, Image
+    from jb_service.types import FilePath, Audio, AudioLazy, Image
     
     class MyService(Service):
         @method
@@ -17,6 +18,13 @@ Usage:
             # data is numpy array
             ...
         
+        @method
+        def preview_audio(self, audio: AudioLazy) -> dict:
+            with audio:
+                # First five seconds only
+                data = audio.read(5 * audio.samplerate)
+            ...
+        
         @method
         def process_image(self, image: Image) -> dict:
             # image is PIL.Image
@@ -30,6 +38,7 @@ Usage:
                 ...
 """
 from typing import NewType, Tuple, Union, TYPE_CHECKING
+import importlib
 import os
 
 # Type aliases for type hints
@@ -46,93 +55,233 @@ else:
     Audio = NewType('Audio', tuple)
     Image = NewType('Image', object)
 
+# Audio opened for partial reads; the method receives a LazyAudio
+AudioLazy = NewType('AudioLazy', object)
+
+
+# Names of the file types above, as annotations or string annotations
+_FILE_TYPE_NAMES = frozenset(('FilePath', 'Audio', 'AudioLazy', 'Image'))
+
 
 def is_file_type(annotation) -> bool:
     """Check if an annotation is one of our file types."""
-    # Handle NewType - check __supertype__ for the base type name
-    type_name = getattr(annotation, '__name__', None)
-    if type_name in ('FilePath', 'Audio', 'Image'):
-        return True
-    
-    # Handle string annotations
-    if isinstance(annotation, str):
-        return annotation in ('FilePath', 'Audio', 'Image')
-    
-    return False
+    return get_file_type_name(annotation) is not None
 
 
 def get_file_type_name(annotation) -> str | None:
     """Get the name of a file type annotation."""
-    type_name = getattr(annotation, '__name__', None)
-    if type_name in ('FilePath', 'Audio', 'Image'):
+    # NewTypes carry their name in __name__; string annotations are the name
+    type_name = annotation if isinstance(annotation, str) else getattr(annotation, '__name__', None)
+    if type_name in _FILE_TYPE_NAMES:
         return type_name
+    return None
+
+
+def _read_soundfile(path: str) -> tuple:
+    import soundfile as sf
+    data, sample_rate = sf.read(path)
+    return (sample_rate, data)
+
+
+def _read_scipy(path: str) -> tuple:
+    from scipy.io import wavfile
+    sample_rate, data = wavfile.read(path)
+    return (sample_rate, data)
+
+
+def _read_librosa(path: str) -> tuple:
+    import librosa
+    data, sample_rate = librosa.load(path, sr=None)
+    return (sample_rate, data)
+
+
+# (loader, errors that mean "try the next loader") for each installed audio
+# library, in order of preference; probed on the first load_audio() call
+_audio_backends: list | None = None
+
+
+def _resolve_audio_backends() -> list:
+    """
+    Find which audio libraries are installed.
     
-    if isinstance(annotation, str) and annotation in ('FilePath', 'Audio', 'Image'):
-        return annotation
+    soundfile (libsndfile) handles WAV, FLAC, OGG and more at C speed, so
+    scipy is only used when soundfile is missing. librosa is much slower and
+    is kept for codecs libsndfile refuses.
+    """
+    def installed(module: str) -> bool:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            return False
+        return True
     
-    return None
+    backends = []
+    if installed('soundfile'):
+        # libsndfile reports unsupported formats as RuntimeError
+        # (soundfile.LibsndfileError in newer releases)
+        backends.append((_read_soundfile, RuntimeError))
+    elif installed('scipy.io.wavfile'):
+        # Raised for anything that isn't a readable WAV
+        backends.append((_read_scipy, ValueError))
+    if installed('librosa'):
+        backends.append((_read_librosa, ()))
+    return backends
 
 
 def load_audio(path: str) -> tuple:
     """
     Load audio file as (sample_rate, numpy_array).
     
-    Tries soundfile first (supports many formats), falls back to scipy.
+    Uses soundfile (or scipy for WAV when soundfile is not installed), and
+    falls back to librosa for formats those can't decode.
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Audio file not found: {path}")
+    global _audio_backends
     
-    # Try soundfile first (handles more formats)
-    try:
-        import soundfile as sf
-        data, sample_rate = sf.read(path)
-        return (sample_rate, data)
-    except ImportError:
-        pass
-    except Exception:
-        pass
+    if _audio_backends is None:
+        _audio_backends = _resolve_audio_backends()
     
-    # Fall back to scipy
-    try:
-        from scipy.io import wavfile
-        sample_rate, data = wavfile.read(path)
-        return (sample_rate, data)
-    except ImportError:
-        pass
-    except Exception:
-        pass
+    if not _audio_backends:
+        raise ImportError(
+            "No audio library available. Install one of: soundfile, scipy, librosa\n"
+            "  pip install soundfile\n"
+            "  pip install scipy\n"
+            "  pip install librosa"
+        )
     
-    # Last resort: try librosa
+    # No exists() probe up front: the loader's own open() finds missing files
+    last = _audio_backends[-1][0]
     try:
-        import librosa
-        data, sample_rate = librosa.load(path, sr=None)
-        return (sample_rate, data)
-    except ImportError:
-        pass
+        for loader, fallback_errors in _audio_backends:
+            try:
+                return loader(path)
+            except fallback_errors:
+                # libsndfile reports a missing file as a generic open error
+                if not os.path.exists(path):
+                    raise FileNotFoundError(path) from None
+                if loader is last:
+                    raise
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Audio file not found: {path}") from None
+
+
+class LazyAudio:
+    """
+    An open audio file that decodes only the frames that are read.
     
-    raise ImportError(
-        "No audio library available. Install one of: soundfile, scipy, librosa\n"
-        "  pip install soundfile\n"
-        "  pip install scipy\n"
-        "  pip install librosa"
-    )
+    Passed to methods annotated with AudioLazy. Use it as a context manager,
+    or call close(), to release the file.
+    """
+    
+    def __init__(self, path: str):
+        try:
+            import soundfile as sf
+        except ImportError:
+            raise ImportError(
+                "AudioLazy requires soundfile. Install it:\n"
+                "  pip install soundfile"
+            )
+        self.path = path
+        self._file = sf.SoundFile(path)
+    
+    @property
+    def samplerate(self) -> int:
+        return self._file.samplerate
+    
+    @property
+    def frames(self) -> int:
+        return self._file.frames
+    
+    @property
+    def channels(self) -> int:
+        return self._file.channels
+    
+    def read(self, frames: int = -1, start: int | None = None, dtype: str = 'float64'):
+        """
+        Read frames (all remaining if -1).
+        
+        Starts at frame start if given, otherwise continues from where the
+        previous read stopped, so blocks can be read in a loop.
+        """
+        if start is not None:
+            self._file.seek(start)
+        return self._file.read(frames, dtype=dtype)
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_audio_lazy(path: str) -> LazyAudio:
+    """
+    Open audio file as a LazyAudio without decoding it.
+    """
+    try:
+        return LazyAudio(path)
+    except RuntimeError:
+        # libsndfile reports a missing file as a generic open error
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Audio file not found: {path}") from None
+        raise
+
+
+# PIL.Image.open, once PIL has been imported by load_image()
+_image_open = None
 
 
 def load_image(path: str):
     """
     Load image file as PIL.Image.
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Image file not found: {path}")
+    global _image_open
+    
+    if _image_open is None:
+        try:
+            from PIL import Image as PILImage
+        except ImportError:
+            raise ImportError(
+                "PIL not available. Install it:\n"
+                "  pip install Pillow"
+            )
+        _image_open = PILImage.open
     
     try:
-        from PIL import Image as PILImage
-        return PILImage.open(path)
-    except ImportError:
-        raise ImportError(
-            "PIL not available. Install it:\n"
-            "  pip install Pillow"
-        )
+        return _image_open(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Image file not found: {path}") from None
+
+
+def preload_file_loaders(type_names) -> None:
+    """
+    Import the libraries behind the given file types ahead of time.
+    
+    Moves the import cost (e.g. libsndfile, PIL) from the first call that
+    receives a file to service startup. Missing libraries are skipped here;
+    loading still reports them.
+    """
+    global _audio_backends, _image_open
+    
+    if _audio_backends is None and ('Audio' in type_names or 'AudioLazy' in type_names):
+        _audio_backends = _resolve_audio_backends()
+    
+    if _image_open is None and 'Image' in type_names:
+        try:
+            from PIL import Image as PILImage
+        except ImportError:
+            return
+        _image_open = PILImage.open
+
+
+# Loader for each file type that isn't passed through as a path
+_FILE_LOADERS = {
+    'Audio': load_audio,
+    'AudioLazy': load_audio_lazy,
+    'Image': load_image,
+}
 
 
 def convert_file_param(value: str, type_name: str):
@@ -141,19 +290,13 @@ def convert_file_param(value: str, type_name: str):
     
     Args:
         value: The file path string
-        type_name: One of 'FilePath', 'Audio', 'Image'
+        type_name: One of 'FilePath', 'Audio', 'AudioLazy', 'Image'
     
     Returns:
-        The converted value (path string, audio tuple, or PIL Image)
-    """
-    if type_name == 'FilePath':
-        return value
-    elif type_name == 'Audio':
-        return load_audio(value)
-    elif type_name == 'Image':
-        return load_image(value)
-    else:
-        return value
+        The converted value (path string, audio tuple, LazyAudio, or PIL Image)
+    """
+    loader = _FILE_LOADERS.get(type_name)
+    return value if loader is None else loader(value)
 
 
 # Output helpers
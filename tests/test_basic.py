@@ -31,28 +31,68 @@ class Calculator(Service):
         return a / b
 
 
+@pytest.fixture(scope="module")
+def calc():
+    """A shared Calculator; it has no state, so tests can reuse one instance."""
+    return Calculator()
+
+
 class TestMethod:
-    def test_method_decorator(self):
+    def test_method_decorator(self, calc):
         """Test that @method marks functions correctly."""
         from jb_service.method import is_method
         
-        calc = Calculator()
         assert is_method(calc.add)
         assert is_method(calc.divide)
         assert not is_method(calc.setup)
     
-    def test_method_call(self):
+    def test_method_call(self, calc):
         """Test that methods are callable."""
-        calc = Calculator()
         assert calc.add(1, 2) == 3
         assert calc.divide(10, 2) == 5
         assert calc.divide(10) == 10  # default b=1.0
+    
+    def test_method_info(self):
+        """Test the dispatch metadata resolved for each method."""
+        from jb_service.types import FilePath, Image
+        
+        class Tool(Service):
+            @method
+            async def fetch(self, path: FilePath, mask: Image = None, retries: int = 0) -> str:
+                return path
+        
+        info = Tool._method_info["fetch"]
+        assert info.is_async
+        assert not info.is_stream
+        # FilePath is passed through untouched, so only mask needs loading
+        assert info.file_params == (("mask", "Image"),)
+        assert not Calculator._method_info["add"].is_async
+        assert info.single_arg == "path"
+        assert Calculator._method_info["add"].single_arg is None
+    
+    def test_method_info_forward_reference(self):
+        """Test that hints referring to names defined after the class resolve."""
+        namespace = {}
+        exec(
+            "from __future__ import annotations\n"
+            "from jb_service import Service, method\n"
+            "from jb_service import types as jt\n"
+            "class Sizer(Service):\n"
+            "    @method\n"
+            "    def size(self, img: jt.Image) -> Size:\n"
+            "        return Size()\n"
+            "class Size:\n"
+            "    pass\n",
+            namespace,
+        )
+        sizer = namespace["Sizer"]
+        assert sizer._method_info["size"].file_params == (("img", "Image"),)
+        assert sizer._file_types == {"Image"}
 
 
 class TestSchema:
-    def test_method_schema(self):
+    def test_method_schema(self, calc):
         """Test schema generation for a method."""
-        calc = Calculator()
         schema = method_to_schema(calc.add)
         
         assert schema["name"] == "add"
@@ -61,15 +101,60 @@ class TestSchema:
         assert schema["input"]["properties"]["b"]["type"] == "number"
         assert schema["input"]["required"] == ["a", "b"]
     
-    def test_method_schema_with_default(self):
+    def test_method_schema_with_default(self, calc):
         """Test schema generation with default values."""
-        calc = Calculator()
         schema = method_to_schema(calc.divide)
         
         assert "a" in schema["input"]["required"]
         assert "b" not in schema["input"]["required"]
         assert schema["input"]["properties"]["b"]["default"] == 1.0
     
+    def test_schema_copies(self):
+        """Test that cached schemas are handed out as independent copies."""
+        from typing import Annotated
+        from jb_service.schema import python_type_to_schema
+        
+        class Tagger(Service):
+            @method
+            def tag(self, items: list[str]) -> list[str]:
+                return items
+        
+        schema = method_to_schema(Tagger.tag)
+        schema["input"]["properties"]["items"]["items"]["type"] = "changed"
+        
+        assert method_to_schema(Tagger.tag)["input"]["properties"]["items"]["items"] == {"type": "string"}
+        assert python_type_to_schema(list[str]) == {"type": "array", "items": {"type": "string"}}
+        
+        # Unhashable hints can't be cached, but still get a schema
+        hint = list[Annotated[str, {"max_length": 8}]]
+        assert python_type_to_schema(hint) == {"type": "array", "items": {"type": "object"}}
+    
+    def test_batch_method_schema(self):
+        """Test that batch methods publish the schema of a single call."""
+        from typing_extensions import NotRequired, TypedDict
+        
+        class Item(TypedDict):
+            text: str
+            lang: NotRequired[str]
+        
+        class Embedder(Service):
+            @method(batch=True)
+            def embed(self, batch: list[Item]) -> list[list[float]]:
+                return [[0.0] for _ in batch]
+            
+            @method(batch=True)
+            def echo(self, batch: list[dict]) -> list:
+                return batch
+        
+        schema = method_to_schema(Embedder.embed)
+        assert schema["input"]["properties"]["text"] == {"type": "string"}
+        assert schema["input"]["required"] == ["text"]
+        assert schema["output"] == {"type": "array", "items": {"type": "number"}}
+        
+        schema = method_to_schema(Embedder.echo)
+        assert schema["input"] == {"type": "object"}
+        assert schema["output"] == {"type": "object"}
+    
     def test_service_schema(self):
         """Test schema generation for a service."""
         schema = service_to_schema(Calculator)
@@ -79,24 +164,130 @@ class TestSchema:
         assert "test calculator" in schema["description"].lower()
         assert "add" in schema["methods"]
         assert "divide" in schema["methods"]
+        
+        # Schemas are cached per class; callers get their own copy
+        del schema["methods"]["add"]
+        schema["methods"]["divide"]["input"]["properties"]["a"]["type"] = "changed"
+        fresh = service_to_schema(Calculator)
+        assert "add" in fresh["methods"]
+        assert fresh["methods"]["divide"]["input"]["properties"]["a"]["type"] == "number"
+
+
+class TestProtocol:
+    def test_handle_call(self, calc):
+        """Test REPL protocol dispatch, validation and errors."""
+        from jb_service.protocol import Protocol
+        
+        protocol = Protocol(calc)
+        
+        response = protocol.handle_call("add", {"a": "1", "b": 2})
+        assert response == {"ok": True, "result": 3.0, "done": True}
+        
+        response = protocol.handle_call("add", {"a": "x", "b": 2})
+        assert not response["ok"]
+        assert "Invalid parameters" in response["error"]["message"]
+        
+        response = protocol.handle_call("missing", {})
+        assert response["error"]["type"] == "AttributeError"
+    
+    def test_msgpack_unencodable_result(self):
+        """Test that JB_ENCODE=msgpack turns an unencodable result into an error."""
+        import os
+        import subprocess
+        import sys
+        
+        msgpack = pytest.importorskip("msgpack")
+        code = (
+            "import sys\n"
+            "from jb_service.protocol import _dumps\n"
+            "sys.stdout.buffer.write(_dumps({'ok': True, 'result': 2 ** 64}))\n"
+        )
+        env = dict(os.environ, JB_ENCODE="msgpack")
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, env=env, timeout=10
+        )
+        assert result.returncode == 0, result.stderr
+        response = msgpack.unpackb(result.stdout)
+        assert response["ok"] is False
+        assert response["error"]["type"] == "OverflowError"
+
+
+class TestMsgpackWrapper:
+    async def test_generated_adapter(self, calc):
+        """Test that msgpack handlers call methods with the right arguments."""
+        from jb_service.msgpack_protocol import _create_method_wrapper
+        
+        divide = _create_method_wrapper(calc.divide, Calculator._method_info["divide"])
+        
+        assert await divide({"a": 10, "b": 2}, 1) == 5
+        assert await divide({"a": 10}, 1) == 10  # default b=1.0
+        assert await divide(10, 1) == 10  # bare value for the single required arg
+        with pytest.raises(Exception, match="unexpected keyword"):
+            await divide({"a": 1, "c": 2}, 1)
+    
+    async def test_batch_wrapper(self):
+        """Test that concurrent requests to a batch method are coalesced."""
+        import asyncio
+        from jb_service.msgpack_protocol import _create_batch_wrapper
+        
+        class Doubler(Service):
+            @method(batch=True)
+            def double(self, batch: list[dict]) -> list:
+                self.calls = getattr(self, "calls", 0) + 1
+                return [item["x"] * 2 for item in batch]
+        
+        svc = Doubler()
+        handler = _create_batch_wrapper(svc.double, Doubler._method_info["double"])
+        
+        results = await asyncio.gather(*(handler({"x": i}, i) for i in range(5)))
+        assert results == [0, 2, 4, 6, 8]
+        assert svc.calls == 1
 
 
 class TestService:
-    def test_service_init(self):
+    def test_service_init(self, calc):
         """Test service initialization."""
-        calc = Calculator()
         assert calc.name == "calculator"
         assert calc.version == "1.0.0"
         assert "add" in calc._methods
         assert "divide" in calc._methods
     
-    def test_service_logger(self):
+    def test_service_logger(self, calc):
         """Test that logger is available."""
-        calc = Calculator()
         assert hasattr(calc, 'log')
         # Just verify it doesn't crash
         calc.log.info("test message")
     
+    def test_service_logger_levels(self):
+        """Test that enabled loggers emit and disabled levels are skipped."""
+        from jb_service.service import ServiceLogger
+        
+        emitted = []
+        
+        class RecordingLogger(ServiceLogger):
+            def _emit(self, level, message, extra=None):
+                emitted.append(level)
+        
+        log = RecordingLogger("test")
+        
+        log.info("off")
+        assert emitted == []
+        
+        log._enabled = True
+        log.info("on")
+        log._level_mask &= ~1  # filter out debug
+        log.debug("skipped")
+        log.error("kept")
+        assert emitted == ["info", "error"]
+    
+    def test_log_line_encoding(self):
+        """Test that log lines with lone surrogates are escaped, not raised."""
+        from jb_service.service import _dumps_line, _json_line
+        
+        name = b"caf\xe9".decode("utf-8", "surrogateescape")
+        for encode in (_dumps_line, _json_line):
+            assert encode({"message": name}) == b'{"message":"caf\\udce9"}\n'
+    
     def test_default_name(self):
         """Test that name defaults to class name."""
         class MyService(Service):
@@ -106,3 +297,162 @@ class TestService:
         
         svc = MyService()
         assert svc.name == "myservice"
+    
+    def test_async_lifecycle_flags(self):
+        """Test that overridden async setup/teardown are detected."""
+        class AsyncSetup(Service):
+            async def setup_async(self):
+                pass
+        
+        assert AsyncSetup._has_setup_async
+        assert not AsyncSetup._has_teardown_async
+        assert not Calculator._has_setup_async
+
+
+class TestLogWriter:
+    @staticmethod
+    def redirect_stderr(monkeypatch):
+        """Point sys.stderr at a byte buffer the writer can write to."""
+        import io
+        import sys
+        
+        # Done inside the test: pytest's capturing resets sys.stderr between
+        # fixture setup and the test call
+        stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        monkeypatch.setattr(sys, "stderr", stream)
+        return stream.buffer
+    
+    @staticmethod
+    def make_writer(max_queue: int = 10000):
+        """A writer that never starts its thread, so tests control flushing."""
+        from jb_service.service import _LogWriter
+        
+        class ManualWriter(_LogWriter):
+            _MAX_QUEUE = max_queue
+            
+            def _start(self):
+                pass
+        
+        return ManualWriter()
+    
+    def test_urgent_lines_are_written_immediately(self, monkeypatch):
+        """Test that an urgent line is written along with what was queued."""
+        stderr = self.redirect_stderr(monkeypatch)
+        writer = self.make_writer()
+        writer.write(b"info\n")
+        assert stderr.getvalue() == b""
+        
+        writer.write(b"error\n", urgent=True)
+        assert stderr.getvalue() == b"info\nerror\n"
+    
+    def test_close_drains_and_reports_drops(self, monkeypatch):
+        """Test that close() writes queued lines and the dropped-line count."""
+        import json
+        
+        stderr = self.redirect_stderr(monkeypatch)
+        writer = self.make_writer(max_queue=4)
+        for i in range(6):
+            writer.write(b"%d\n" % i)
+        writer.close()
+        
+        lines = stderr.getvalue().splitlines()
+        assert lines[:4] == [b"2", b"3", b"4", b"5"]
+        assert json.loads(lines[4])["log"]["message"] == "Dropped 2 log messages"
+        assert len(lines) == 5
+    
+    def test_reset_after_fork(self):
+        """Test that a forked child starts with a fresh, empty writer."""
+        import os
+        from jb_service.service import _writer
+        
+        if not hasattr(os, "fork"):
+            pytest.skip("needs os.fork")
+        
+        lock = _writer._lock
+        _writer._queue.append(b"parent line\n")
+        try:
+            pid = os.fork()
+            if pid == 0:
+                fresh = (
+                    not _writer._queue and _writer._thread is None
+                    and _writer._lock is not lock and not _writer._closed
+                )
+                os._exit(0 if fresh else 1)
+            _, status = os.waitpid(pid, 0)
+            assert os.waitstatus_to_exitcode(status) == 0
+        finally:
+            _writer._queue.clear()
+    
+    def test_thread_writes_and_stops_after_main_exits(self):
+        """Test that the writer thread flushes and lets the process exit."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import atexit\n"
+            "from jb_service.service import ServiceLogger, _writer\n"
+            "atexit.unregister(_writer.close)\n"
+            "log = ServiceLogger('t')\n"
+            "log._enabled = True\n"
+            "log.info('last words')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, timeout=10
+        )
+        assert result.returncode == 0
+        assert b"last words" in result.stderr
+
+
+class TestFileStore:
+    def test_stale_connection_retry(self):
+        """Test that only idempotent requests are resent on a dropped connection."""
+        import json
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from jb_service.filestore import FileStore, FileStoreError
+        
+        seen = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            timeout = 0.1  # Drop idle keep-alive connections quickly
+            
+            def respond(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                seen.append(self.command)
+                if seen.count("PATCH") == 1:
+                    # Handled, but the connection dies before the reply
+                    self.close_connection = True
+                    return
+                body = json.dumps({
+                    "id": "f1", "name": "a.txt", "size": 1, "sha256": "",
+                    "created_at": 0,
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            do_GET = do_PATCH = respond
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            store = FileStore(f"http://127.0.0.1:{server.server_port}")
+            assert store.info("f1").name == "a.txt"
+            time.sleep(0.3)
+            assert store.info("f1").name == "a.txt"
+            assert seen == ["GET", "GET"]
+            
+            # The lost PATCH reached the server, so it must not be sent twice
+            with pytest.raises(FileStoreError):
+                store.rename("f1", "b.txt")
+            assert seen == ["GET", "GET", "PATCH"]
+            assert store.rename("f1", "b.txt").id == "f1"
+        finally:
+            server.shutdown()
+            server.server_close()